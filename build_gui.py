@@ -2,10 +2,15 @@
 """
 Build script for the Schoology Converter GUI application.
 This script can be used to build the application locally using PyInstaller.
+
+Incremental rebuilds reuse PyInstaller's analysis cache in build/ and the
+per-user cache directory, so only changed modules are re-analyzed.
+Run `rm -rf build dist` to force a cold build.
 """
 
 import os
 import sys
+import shutil
 import subprocess
 import platform
 from pathlib import Path
@@ -21,9 +26,17 @@ def main():
         print("PyInstaller not found. Installing...")
         subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
     
-    # Install project dependencies
+    # Install project dependencies. Build wheels into a local wheelhouse
+    # first so repeated builds install from ~/.cache instead of re-resolving
+    # and re-downloading from PyPI.
     print("Installing project dependencies...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "-e", "."], check=True)
+    wheel_dir = Path.home() / ".cache" / "cc_converter_wheels"
+    subprocess.run([sys.executable, "-m", "pip", "install", "-U", "pip", "wheel"], check=True)
+    subprocess.run([sys.executable, "-m", "pip", "wheel", "--wheel-dir", str(wheel_dir), "."], check=True)
+    subprocess.run([
+        sys.executable, "-m", "pip", "install",
+        "--no-build-isolation", "--find-links", str(wheel_dir), "-e", "."
+    ], check=True)
     
     # Build the application
     print("Building GUI application...")
@@ -34,9 +47,17 @@ def main():
         # Windows build
         cmd = [
             "pyinstaller",
-            "--onefile",
+            "--onedir",
             "--windowed",
+            "--noconfirm",
+            "--workpath", "build",
+            "--distpath", "dist",
             "--name", "SchoologyConverter",
+            "--exclude-module", "tkinter",
+            "--exclude-module", "unittest",
+            "--exclude-module", "pydoc",
+            "--exclude-module", "doctest",
+            "--exclude-module", "test",
             "--add-data", "cc_converter/template.docx;cc_converter",
             "--add-data", "cc_converter/templates;cc_converter/templates",
             "--add-data", "cc_converter/file_handler.html;cc_converter",
@@ -46,23 +67,39 @@ def main():
         # macOS build - use the spec file for proper .app bundle
         cmd = [
             "pyinstaller",
+            "--noconfirm",
+            "--workpath", "build",
+            "--distpath", "dist",
             "SchoologyConverter.spec"
         ]
     else:  # Linux
         # Linux build
         cmd = [
             "pyinstaller",
-            "--onefile",
+            "--onedir",
             "--windowed",
+            "--noconfirm",
+            "--workpath", "build",
+            "--distpath", "dist",
             "--name", "SchoologyConverter",
+            "--exclude-module", "tkinter",
+            "--exclude-module", "unittest",
+            "--exclude-module", "pydoc",
+            "--exclude-module", "doctest",
+            "--exclude-module", "test",
             "--add-data", "cc_converter/template.docx:cc_converter",
             "--add-data", "cc_converter/templates:cc_converter/templates",
             "--add-data", "cc_converter/file_handler.html:cc_converter",
             "run_gui.py"
         ]
-    
+
+    # Keep PyInstaller's cache in a stable per-user location so repeated
+    # builds reuse cached module analysis and compressed libraries.
+    build_env = os.environ.copy()
+    build_env.setdefault("PYINSTALLER_CONFIG_DIR", str(Path.home() / ".cache" / "pyinstaller"))
+
     try:
-        subprocess.run(cmd, check=True)
+        subprocess.run(cmd, check=True, env=build_env)
         print("Build completed successfully!")
         
         if system == "Darwin":
@@ -77,12 +114,24 @@ def main():
             
             # Create a zip archive for distribution
             print("Creating zip archive...")
-            subprocess.run(["cd", "dist", "&&", "zip", "-r", "SchoologyConverter-macOS.zip", "SchoologyConverter.app"], shell=True, check=True)
-            print(f"macOS zip archive: {Path('dist') / 'SchoologyConverter-macOS.zip'}")
+            archive = shutil.make_archive(
+                str(Path('dist') / 'SchoologyConverter-macOS'), 'zip',
+                root_dir='dist', base_dir='SchoologyConverter.app'
+            )
+            print(f"macOS zip archive: {archive}")
         else:
-            # For Windows and Linux, the output is an executable
+            # For Windows and Linux, the output is a directory bundle; launching
+            # it avoids the per-run unpack cost of a onefile executable
             exe_name = "SchoologyConverter.exe" if system == "Windows" else "SchoologyConverter"
-            print(f"Executable location: {Path('dist') / exe_name}")
+            print(f"Executable location: {Path('dist') / 'SchoologyConverter' / exe_name}")
+
+            # Zip the bundle so users still get a single distributable artifact
+            print("Creating zip archive...")
+            archive = shutil.make_archive(
+                str(Path('dist') / 'SchoologyConverter'), 'zip',
+                root_dir='dist', base_dir='SchoologyConverter'
+            )
+            print(f"Distribution archive: {archive}")
             
     except subprocess.CalledProcessError as e:
         print(f"Build failed with error: {e}")
@@ -1,8 +1,25 @@
 __version__ = '0.1.0'
 
-from cc_converter.xml_parser import parse_cartridge, ParserError
-from cc_converter.docx_converter import convert_assessment_to_docx
-from cc_converter.hierarchy_converter import HierarchyConverter
-
 __all__ = ['parse_cartridge', 'ParserError', 'convert_assessment_to_docx', 'HierarchyConverter']
 
+# Map each public name to the submodule that defines it so that importing
+# cc_converter does not pull in python-docx and the converters until a
+# caller actually needs them (PEP 562 lazy loading).
+_LAZY_IMPORTS = {
+    'parse_cartridge': 'cc_converter.xml_parser',
+    'ParserError': 'cc_converter.xml_parser',
+    'convert_assessment_to_docx': 'cc_converter.docx_converter',
+    'HierarchyConverter': 'cc_converter.hierarchy_converter',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(module_name), name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,12 @@
 import argparse
+import functools
+import io
+import os
 import sys
 import zipfile
 import shutil
+from contextlib import redirect_stderr, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Optional, List, Any
 import json
@@ -11,7 +16,7 @@ from cc_converter.docx_converter import convert_assessment_to_docx
 from cc_converter.hierarchy_converter import HierarchyConverter
 
 
-def parse_args(argv=None):
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Convert and unpack 1EdTech Schoology files"
     )
@@ -37,6 +42,10 @@ def parse_args(argv=None):
     convert_parser.add_argument(
         "--limit", type=int, help="Maximum number of assessments to process", default=None
     )
+    convert_parser.add_argument(
+        "--force", action="store_true",
+        help="Re-convert cartridges even if their output is already up to date"
+    )
     
     # Unpack command
     unpack_parser = subparsers.add_parser('unpack', help='Unpack cartridge files to directories')
@@ -53,7 +62,107 @@ def parse_args(argv=None):
         default=Path("unpacked")
     )
 
-    return parser.parse_args(argv)
+    return parser
+
+
+# Parser construction is non-trivial; build it once and reuse across calls
+_PARSER = None
+
+
+def parse_args(argv=None):
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER.parse_args(argv)
+
+
+def _find_imscc_files(directory: Path) -> List[Path]:
+    """Find .imscc files in a directory with a single os.scandir pass.
+
+    DirEntry.is_file() reuses the file type cached by the directory read,
+    avoiding the per-entry stat calls that Path.glob performs.
+    """
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path) for entry in entries
+            if entry.is_file() and entry.name.lower().endswith('.imscc')
+        ]
+
+
+@functools.lru_cache(maxsize=8)
+def _load_font_mapping_file(path: str, mtime: float) -> Dict[str, str]:
+    """Read and parse a font mapping JSON file, cached on (path, mtime)."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_font_mapping(font_map_path: Optional[str]) -> Optional[Dict[str, str]]:
+    """Load a font mapping JSON file.
+
+    Repeated calls within the same process reuse the cached parse as long
+    as the file has not been modified.
+    """
+    if not font_map_path:
+        return None
+    path = os.fspath(Path(font_map_path).resolve())
+    return _load_font_mapping_file(path, os.path.getmtime(path))
+
+
+class ConvertError(Exception):
+    """Raised when converting or unpacking a single cartridge fails.
+
+    Workers raise this instead of calling sys.exit so that pool-based runs
+    can report the failure and keep processing the remaining files.
+    """
+    pass
+
+
+# Name of the sentinel file stamped into each converted output directory,
+# recording the source cartridge mtime for freshness checks
+_SENTINEL_NAME = '.converted'
+
+
+def _is_up_to_date(sentinel: Path, source_mtime: float) -> bool:
+    """Check whether a previous conversion is at least as new as the input."""
+    try:
+        return float(sentinel.read_text()) >= source_mtime
+    except (OSError, ValueError):
+        return False
+
+
+# Directories already created by this process; lets _ensure_dir skip the
+# mkdir syscall when the same output tree is touched repeatedly
+_CREATED_DIRS: set = set()
+
+
+def _ensure_dir(path) -> None:
+    """Create a directory (and parents) once per process."""
+    s = os.fspath(path)
+    if s in _CREATED_DIRS:
+        return
+    os.makedirs(s, exist_ok=True)
+    _CREATED_DIRS.add(s)
+
+
+def _extract_member(zf: zipfile.ZipFile, member: zipfile.ZipInfo, dest_dir: Path) -> None:
+    """Extract one zip member, streaming through a 1 MiB buffer.
+
+    Streaming with shutil.copyfileobj keeps memory flat for large members
+    and issues far fewer read/write syscalls than ZipFile.extract's small
+    default buffer.
+    """
+    name = member.filename
+    target = dest_dir / name
+    # Guard against entries that would escape the output directory
+    if not str(target.resolve()).startswith(str(dest_dir.resolve()) + os.sep):
+        print(f"Skipping unsafe zip entry: {name}", file=sys.stderr)
+        return
+    if name.endswith('/'):
+        _ensure_dir(target)
+        return
+    _ensure_dir(target.parent)
+    with zf.open(member) as src, open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
 
 
 def unpack_cartridge(input_path: Path, output_path: Path) -> None:
@@ -61,21 +170,23 @@ def unpack_cartridge(input_path: Path, output_path: Path) -> None:
     try:
         # Create output directory named after the cartridge
         cartridge_output = output_path / input_path.stem
-        cartridge_output.mkdir(parents=True, exist_ok=True)
-        
-        # Extract all files from the cartridge
+        _ensure_dir(cartridge_output)
+
+        # Extract members concurrently; zlib releases the GIL during
+        # inflate, so threads overlap decompression with disk writes
         with zipfile.ZipFile(input_path, 'r') as zf:
-            zf.extractall(cartridge_output)
-        
+            members = zf.infolist()
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as executor:
+                list(executor.map(lambda m: _extract_member(zf, m, cartridge_output), members))
+
         print(f"Unpacked {input_path} to {cartridge_output}")
     except Exception as e:
-        print(f"Error unpacking cartridge {input_path}: {str(e)}", file=sys.stderr)
-        sys.exit(1)
+        raise ConvertError(f"Error unpacking cartridge {input_path}: {str(e)}") from e
 
 
-def process_single_file(input_path: Path, output_path: Path, font_mapping: Optional[Dict], limit: Optional[int], is_single_cartridge: bool = False, shared_loose_files_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+def process_single_file(input_path: Path, output_path: Path, font_mapping: Optional[Dict], limit: Optional[int], is_single_cartridge: bool = False, shared_loose_files_dir: Optional[Path] = None, force: bool = False, font_map_mtime: Optional[float] = None) -> Optional[Dict[str, Any]]:
     """Process a single input file and convert it to hierarchical structure with DOCX files.
-    
+
     Args:
         input_path: Path to the cartridge file
         output_path: Base output directory
@@ -83,7 +194,10 @@ def process_single_file(input_path: Path, output_path: Path, font_mapping: Optio
         limit: Maximum number of assessments to process
         is_single_cartridge: Whether this is a single cartridge conversion (output directly to output_path)
         shared_loose_files_dir: Optional shared loose files directory
-    
+        force: Re-convert even if the existing output is up to date
+        font_map_mtime: Optional mtime of the font mapping file, included in
+            the freshness check so font map edits trigger re-conversion
+
     Returns:
         Dictionary containing hierarchy data if successful, None otherwise
     """
@@ -97,20 +211,45 @@ def process_single_file(input_path: Path, output_path: Path, font_mapping: Optio
             else:
                 # For multiple cartridges, create a subdirectory
                 cartridge_output = output_path / input_path.stem
-                cartridge_output.mkdir(parents=True, exist_ok=True)
-            
+                _ensure_dir(cartridge_output)
+
+            # Skip cartridges whose existing output is newer than the input
+            # (and the font map, if one was given)
+            sentinel = cartridge_output / _SENTINEL_NAME
+            source_mtime = max(input_path.stat().st_mtime, font_map_mtime or 0)
+            if not force and _is_up_to_date(sentinel, source_mtime):
+                print(f"Up-to-date: {cartridge_output}")
+                return None
+
             # Use the enhanced converter
             converter = HierarchyConverter(font_mapping, shared_loose_files_dir=shared_loose_files_dir)
             hierarchy_data = converter.convert_cartridge_with_hierarchy(input_path, cartridge_output, limit)
+            sentinel.write_text(str(source_mtime))
             print(f"Created hierarchical structure with DOCX files in {cartridge_output}")
             return {
                 'cartridge_name': input_path.stem,
-                'cartridge_path': str(cartridge_output.relative_to(output_path)) if not is_single_cartridge else '',
+                # cartridge_output was built as output_path / stem, so the
+                # relative path is just the stem
+                'cartridge_path': input_path.stem if not is_single_cartridge else '',
                 'hierarchy': converter._hierarchy_node_to_dict(hierarchy_data) if hierarchy_data else None
             }
+        except ConvertError:
+            raise
         except Exception as e:
-            print(f"Error processing cartridge {input_path}: {str(e)}", file=sys.stderr)
-            sys.exit(1)
+            raise ConvertError(f"Error processing cartridge {input_path}: {str(e)}") from e
+
+
+def _process_file_job(*args):
+    """Pool worker wrapper that buffers a cartridge's log output.
+
+    Everything the conversion prints is captured and returned as one block,
+    so the parent process can emit it with a single write instead of
+    interleaving small flushes from many workers on the terminal.
+    """
+    buf = io.StringIO()
+    with redirect_stdout(buf), redirect_stderr(buf):
+        result = process_single_file(*args)
+    return result, buf.getvalue()
 
 
 def main(argv=None):
@@ -128,10 +267,11 @@ def main(argv=None):
         limit = args.limit
 
         # Load font mapping if provided
+        font_map_mtime = None
         if args.font_map:
             try:
-                with open(args.font_map, 'r') as f:
-                    font_mapping = json.load(f)
+                font_mapping = load_font_mapping(args.font_map)
+                font_map_mtime = os.path.getmtime(args.font_map)
             except Exception as e:
                 print(f"Error loading font mapping: {str(e)}", file=sys.stderr)
                 sys.exit(1)
@@ -140,14 +280,14 @@ def main(argv=None):
         input_files = []
         if input_path.is_dir():
             # If input is a directory, find all .imscc files
-            input_files = list(input_path.glob("*.imscc"))
+            input_files = _find_imscc_files(input_path)
         elif input_path.is_file():
             # If input is a single file
             input_files = [input_path]
         else:
             print(f"Input path not found: {input_path}", file=sys.stderr)
             sys.exit(1)
-        
+
         if not input_files:
             print(f"No .imscc files found in: {input_path}", file=sys.stderr)
             sys.exit(1)
@@ -168,7 +308,7 @@ def main(argv=None):
                     output_path = input_path.parent / "converted"
         
         # Create base output directory
-        output_path.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(output_path)
 
         # Determine if this is a single cartridge conversion
         is_single_cartridge = len(input_files) == 1
@@ -177,15 +317,44 @@ def main(argv=None):
         shared_loose_files_dir = None
         if not is_single_cartridge:
             shared_loose_files_dir = output_path / "loose_files"
-            shared_loose_files_dir.mkdir(exist_ok=True)
+            _ensure_dir(shared_loose_files_dir)
 
-        # Process each input file
+        # Process each input file; each cartridge is independent, so batches
+        # are converted in parallel across CPU cores
+        existing_files = []
         for input_file in input_files:
             if not input_file.exists():
                 print(f"Input file not found: {input_file}", file=sys.stderr)
                 continue
-            
-            process_single_file(input_file, output_path, font_mapping, limit, is_single_cartridge, shared_loose_files_dir)
+            existing_files.append(input_file)
+
+        failures = 0
+        if len(existing_files) <= 1:
+            for input_file in existing_files:
+                try:
+                    process_single_file(input_file, output_path, font_mapping, limit, is_single_cartridge, shared_loose_files_dir, args.force, font_map_mtime)
+                except ConvertError as e:
+                    print(str(e), file=sys.stderr)
+                    failures += 1
+        else:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = [
+                    executor.submit(_process_file_job, f, output_path, font_mapping, limit, is_single_cartridge, shared_loose_files_dir, args.force, font_map_mtime)
+                    for f in existing_files
+                ]
+                for future in as_completed(futures):
+                    try:
+                        _, log_output = future.result()
+                    except ConvertError as e:
+                        print(str(e), file=sys.stderr)
+                        failures += 1
+                    else:
+                        if log_output:
+                            sys.stdout.write(log_output)
+
+        if failures:
+            print(f"{failures} file(s) failed to convert", file=sys.stderr)
+            sys.exit(1)
     
     elif args.command == 'unpack':
         # Handle unpack command
@@ -196,7 +365,7 @@ def main(argv=None):
         input_files = []
         if input_path.is_dir():
             # If input is a directory, find all .imscc files
-            input_files = list(input_path.glob("*.imscc"))
+            input_files = _find_imscc_files(input_path)
         elif input_path.is_file():
             # If input is a single file
             input_files = [input_path]
@@ -208,22 +377,49 @@ def main(argv=None):
             print(f"No .imscc files found in: {input_path}", file=sys.stderr)
             sys.exit(1)
         
-        # Filter to only .imscc files
-        imscc_files = [f for f in input_files if f.suffix.lower() == '.imscc']
-        
-        if not imscc_files:
+        # _find_imscc_files already filters directory listings in one pass,
+        # so only a directly supplied file still needs its suffix checked
+        if input_path.is_file() and input_path.suffix.lower() != '.imscc':
             print(f"No .imscc files found in: {input_path}", file=sys.stderr)
             sys.exit(1)
-        
+        imscc_files = input_files
+
         # Create base output directory
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        # Unpack each cartridge file
+        _ensure_dir(output_path)
+
+        # Unpack each cartridge file; extraction of independent cartridges
+        # is parallelized the same way as conversion
+        existing_files = []
         for input_file in imscc_files:
             if not input_file.exists():
                 print(f"Input file not found: {input_file}", file=sys.stderr)
                 continue
-            unpack_cartridge(input_file, output_path)
+            existing_files.append(input_file)
+
+        failures = 0
+        if len(existing_files) <= 1:
+            for input_file in existing_files:
+                try:
+                    unpack_cartridge(input_file, output_path)
+                except ConvertError as e:
+                    print(str(e), file=sys.stderr)
+                    failures += 1
+        else:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = [
+                    executor.submit(unpack_cartridge, f, output_path)
+                    for f in existing_files
+                ]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except ConvertError as e:
+                        print(str(e), file=sys.stderr)
+                        failures += 1
+
+        if failures:
+            print(f"{failures} file(s) failed to unpack", file=sys.stderr)
+            sys.exit(1)
 
 
 if __name__ == '__main__':
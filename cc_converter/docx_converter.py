@@ -1,11 +1,112 @@
+import functools
+import hashlib
+import operator
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
 from pathlib import Path
 from typing import Dict, Optional, List, Tuple, Union
 import zipfile
 
+# requests is only needed when assessments embed remote images
+try:
+    import requests
+    from requests.adapters import HTTPAdapter, Retry
+except ImportError:
+    requests = None
+
 from cc_converter.models import Assessment, QuestionType, TextRun, TextStyle, ImageInfo, TextContent
-from docx.shared import Inches
-from docx.enum.style import WD_STYLE_TYPE
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.shared import Mm, Pt, RGBColor
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+_RGB_RE = re.compile(r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)")
+
+_COLOR_NAMES = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "purple": (128, 0, 128),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "gray": (128, 128, 128),
+    "grey": (128, 128, 128),
+}
+
+
+# Saving spends much of its time deflating XML at zipfile's default
+# level 6; level 1 deflates 2-3x faster for a slightly larger file,
+# which is the right trade for batch document generation. Patched
+# defensively: if python-docx reshapes its internals the default writer
+# keeps working.
+try:
+    from docx.opc.phys_pkg import _ZipPkgWriter
+
+    def _fast_zip_pkg_writer_init(self, pkg_file):
+        self._zipf = zipfile.ZipFile(
+            pkg_file, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+
+    _ZipPkgWriter.__init__ = _fast_zip_pkg_writer_init
+except Exception:
+    pass
+
+
+# Tab and break characters that need dedicated elements inside a w:r
+_BREAK_RE = re.compile('([\t\n\r])')
+
+# Canonical "no styling" value; runs carrying it inherit everything from
+# the paragraph style, so no run-level formatting needs to be emitted
+_DEFAULT_STYLE = TextStyle()
+
+# Pixels to millimetres at the CSS reference 96 DPI
+_PX_TO_MM = 25.4 / 96
+
+
+@functools.lru_cache(maxsize=256)
+def _px_to_mm(px: float) -> Mm:
+    """Convert a pixel dimension to an Mm length, memoized per value."""
+    return Mm(px * _PX_TO_MM)
+
+
+# Assessments repeat a handful of distinct colors across thousands of
+# runs, so memoize the parse instead of re-running regex/hex conversion
+@functools.lru_cache(maxsize=512)
+def _parse_color(color_str: str) -> Optional[Tuple[int, int, int]]:
+    """Parse a color string into RGB values."""
+    # Handle hex color values
+    if color_str.startswith("#"):
+        color_hex = color_str.lstrip("#")
+        try:
+            # Parse the whole value once and split channels with shifts
+            # instead of three slice+int calls
+            if len(color_hex) == 3:  # Short form like #RGB
+                v = int(color_hex, 16)
+                return ((v >> 8 & 0xF) * 0x11, (v >> 4 & 0xF) * 0x11, (v & 0xF) * 0x11)
+            elif len(color_hex) == 6:  # Long form like #RRGGBB
+                v = int(color_hex, 16)
+                return (v >> 16 & 0xFF, v >> 8 & 0xFF, v & 0xFF)
+        except ValueError:
+            pass
+
+    # Handle rgb() format
+    rgb_match = _RGB_RE.match(color_str)
+    if rgb_match:
+        try:
+            r = int(rgb_match.group(1))
+            g = int(rgb_match.group(2))
+            b = int(rgb_match.group(3))
+            return (r, g, b)
+        except ValueError:
+            pass
+
+    # Handle common color names
+    return _COLOR_NAMES.get(color_str.lower())
 
 
 class DocxConverter:
@@ -22,6 +123,35 @@ class DocxConverter:
         """
         self.font_mapping = font_mapping or {}
         self.template_path = template_path or Path(__file__).parent / 'template.docx'
+        # Read the template once; each conversion re-opens it from memory
+        # instead of re-reading the file per document
+        self._template_bytes = Path(self.template_path).read_bytes()
+        self._zip_image_cache: Dict[str, bytes] = {}
+        # Archive entry names for the current conversion; membership checks
+        # replace KeyError-driven lookups on missing images
+        self._zip_names: frozenset = frozenset()
+        # Remote images are downloaded once into a temporary disk cache
+        # keyed by URL hash, keeping memory flat however many images a
+        # cartridge embeds; created lazily on first download
+        self._img_cache_dir: Optional[Path] = None
+        # Shared HTTP session so images from the same host reuse pooled
+        # TCP/TLS connections instead of handshaking per download, with a
+        # small retry budget for flaky hosts
+        self._session = None
+        if requests is not None:
+            self._session = requests.Session()
+            # Exponential backoff on transient statuses; rate-limited or
+            # briefly unavailable hosts get retried instead of dropping the
+            # image outright
+            retry = Retry(total=3, backoff_factor=0.5,
+                          status_forcelist=[429, 500, 502, 503, 504])
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                                  max_retries=retry)
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
+        # Resolved (font, size, bold, color, sup, sub) tuples keyed by the
+        # raw style fields; most runs share a handful of styles
+        self._style_cache: Dict[tuple, tuple] = {}
 
     def convert_assessment(
         self, assessment: Assessment, output_path: Path,
@@ -43,7 +173,15 @@ class DocxConverter:
             )
 
         # Create a new document from template
-        doc = Document(self.template_path)
+        doc = Document(BytesIO(self._template_bytes))
+
+        # Pull all zip-hosted images for this assessment up front so the
+        # archive is read sequentially instead of seeking per image
+        self._zip_names = frozenset(resource_zip.namelist()) if resource_zip else frozenset()
+        self._zip_image_cache = self._collect_zip_images(assessment, resource_zip) if resource_zip else {}
+
+        # Warm the remote-image disk cache with concurrent downloads
+        self._prefetch_images(assessment)
 
         # Add the title
         doc.add_heading(assessment.title.strip(), level=1)
@@ -61,7 +199,7 @@ class DocxConverter:
                     
                     if is_answer_key:
                         # Find index where ident is correct response
-                        correct_option_idx = next((idx for idx, opt in enumerate(item.response_options) if opt.ident == item.correct_response), None)
+                        correct_option_idx = {opt.ident: idx for idx, opt in enumerate(item.response_options)}.get(item.correct_response)
                         if correct_option_idx is not None:
                             question_para.add_run(f"__{chr(65 + correct_option_idx)}__ ")
                     else:
@@ -76,18 +214,239 @@ class DocxConverter:
                         self._add_content(option_para, option.text, resource_zip)
 
         # Save the document
-        doc.save(output_path)
+        self._save_document(doc, output_path)
+
+    def convert_pair(
+        self, assessment: Assessment, output_path: Path, key_path: Path,
+        resource_zip: Optional[zipfile.ZipFile] = None
+    ):
+        """Convert an Assessment to the student docx and its answer key.
+
+        The document is built once: the student version is saved, then the
+        recorded answer-blank runs are patched in place (``_____`` becomes
+        ``__A__`` etc.) and the same document is saved again as the key.
+        Template parsing, paragraph construction, and image extraction all
+        happen a single time per assessment instead of twice.
+
+        Args:
+            assessment: The Assessment object to convert.
+            output_path: The path where the student docx will be saved.
+            key_path: The path where the answer-key docx will be saved.
+            resource_zip: An optional zipfile containing resources such as images.
+        """
+        try:
+            from docx import Document
+        except ImportError:
+            raise ImportError(
+                "The 'python-docx' package is required to create docx files"
+            )
+
+        doc = Document(BytesIO(self._template_bytes))
+
+        # Pull all zip-hosted images for this assessment up front so the
+        # archive is read sequentially instead of seeking per image
+        self._zip_names = frozenset(resource_zip.namelist()) if resource_zip else frozenset()
+        self._zip_image_cache = self._collect_zip_images(assessment, resource_zip) if resource_zip else {}
+
+        # Warm the remote-image disk cache with concurrent downloads
+        self._prefetch_images(assessment)
+
+        doc.add_heading(assessment.title.strip(), level=1)
+
+        # Answer-blank runs to rewrite for the key, paired with the index
+        # of the correct option (None when no correct response is recorded)
+        blank_runs = []
+
+        for section_idx, section in enumerate(assessment.sections, 1):
+            for item_idx, item in enumerate(section.items, 1):
+                style_name = 'Question'
+                question_para = doc.add_paragraph(style=style_name)
+
+                if item.question_type == QuestionType.MULTIPLE_CHOICE or item.question_type == QuestionType.TRUE_FALSE:
+                    blank_run = question_para.add_run("_____ ")
+                    correct_option_idx = {opt.ident: idx for idx, opt in enumerate(item.response_options)}.get(item.correct_response)
+                    blank_runs.append((blank_run, correct_option_idx))
+
+                self._add_content(question_para, item.text, resource_zip)
+
+                if item.question_type == QuestionType.MULTIPLE_CHOICE:
+                    for opt_idx, option in enumerate(item.response_options):
+                        option_para = doc.add_paragraph(style='MultiAns')
+                        self._add_content(option_para, option.text, resource_zip)
+
+        # Save the student version
+        self._save_document(doc, output_path)
+
+        # Patch the blanks into answers and save again as the key
+        for blank_run, correct_option_idx in blank_runs:
+            if correct_option_idx is not None:
+                blank_run.text = f"__{chr(65 + correct_option_idx)}__ "
+            else:
+                blank_run.text = ""
+        self._save_document(doc, key_path)
+
+    @staticmethod
+    def _save_document(doc, output_path: Path) -> None:
+        """Save a document through an in-memory buffer in one disk write.
+
+        python-docx writes many small zip entries when saving; buffering
+        them in a BytesIO turns that into a single write syscall.
+        """
+        buf = BytesIO()
+        doc.save(buf)
+        Path(output_path).write_bytes(buf.getvalue())
+
+    @staticmethod
+    def _iter_images(assessment: Assessment):
+        """Yield every ImageInfo referenced by the assessment."""
+        for section in assessment.sections:
+            for item in section.items:
+                contents = [item.text] + [opt.text for opt in item.response_options]
+                for content in contents:
+                    for part in content:
+                        if isinstance(part, ImageInfo):
+                            yield part
+
+    def _prefetch_images(self, assessment: Assessment) -> None:
+        """Download all remote images for an assessment concurrently.
+
+        Warms the disk cache before document assembly so the build loop
+        hits local files; total download time is bounded by the slowest
+        single image rather than the sum of all of them.
+        """
+        if requests is None:
+            return
+        urls = {img.src for img in self._iter_images(assessment)
+                if img.src.startswith(('http://', 'https://'))}
+        if not urls:
+            return
+        # Create the cache directory up front; _fetch_remote_image's lazy
+        # creation is not safe against concurrent first calls
+        if self._img_cache_dir is None:
+            self._img_cache_dir = Path(tempfile.mkdtemp(prefix='cc_converter_img_'))
+        with ThreadPoolExecutor(max_workers=min(16, len(urls))) as executor:
+            futures = [executor.submit(self._fetch_remote_image, url) for url in urls]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception:
+                    # Failures are logged when the image is actually added
+                    pass
+
+    def _collect_zip_images(self, assessment: Assessment, resource_zip: zipfile.ZipFile) -> Dict[str, bytes]:
+        """Read all images the assessment references from the zip in one pass.
+
+        Entries are read ordered by their offset in the archive so the
+        underlying file is scanned front to back rather than seeking back
+        and forth as images are encountered in document order.
+        """
+        names = {img.src for img in self._iter_images(assessment)
+                 if not img.src.startswith(('http://', 'https://'))}
+
+        # Missing entries are reported by _add_inline_image
+        infos = [resource_zip.getinfo(name) for name in names if name in self._zip_names]
+        infos.sort(key=operator.attrgetter('header_offset'))
+        return {info.filename: resource_zip.read(info) for info in infos}
+
+    def _resolve_style(self, style: TextStyle) -> tuple:
+        """Resolve a TextStyle to its cached docx attribute tuple."""
+        key = (style.font_family, style.font_size, style.bold,
+               style.color, style.superscript, style.subscript)
+        cached = self._style_cache.get(key)
+        if cached is None:
+            mapped_font = self.font_mapping.get(style.font_family, style.font_family) if style.font_family else None
+            pt_size = Pt(style.font_size) if style.font_size else None
+            rgb = _parse_color(style.color) if style.color else None
+            color = RGBColor(*rgb) if rgb else None
+            cached = (mapped_font, pt_size, style.bold, color, style.superscript, style.subscript)
+            self._style_cache[key] = cached
+        return cached
+
+    def _build_runs_xml(self, content: List[TextContent]) -> list:
+        """Build w:r elements for a list of text runs directly with lxml.
+
+        Appending runs through paragraph.add_run round-trips the python-docx
+        element API per run; constructing the subtree ourselves and handing
+        it to the paragraph in one extend() call skips that overhead for
+        multi-run paragraphs.
+        """
+        elements = []
+        last_idx = len(content) - 1
+        for idx, item in enumerate(content):
+            text = item.text
+            # Only allocate a stripped copy when a trailing newline exists
+            if idx == last_idx and text.endswith('\n'):
+                text = text.rstrip('\n')
+
+            r = OxmlElement('w:r')
+            rpr = self._build_rpr_xml(item.style)
+            if rpr is not None:
+                r.append(rpr)
+            # Mirror Run.text: tabs and line breaks become their dedicated
+            # elements rather than literal characters inside w:t
+            for part in _BREAK_RE.split(text):
+                if part == '\t':
+                    r.append(OxmlElement('w:tab'))
+                elif part == '\n':
+                    r.append(OxmlElement('w:br'))
+                elif part == '\r':
+                    r.append(OxmlElement('w:cr'))
+                elif part:
+                    t = OxmlElement('w:t')
+                    if part.strip() != part:
+                        t.set(qn('xml:space'), 'preserve')
+                    t.text = part
+                    r.append(t)
+            elements.append(r)
+        return elements
+
+    def _build_rpr_xml(self, style: TextStyle):
+        """Build the w:rPr element for a style, or None for plain runs."""
+        if style == _DEFAULT_STYLE:
+            return None
+
+        mapped_font, pt_size, bold, color, superscript, subscript = self._resolve_style(style)
+        rpr = OxmlElement('w:rPr')
+        # Children must follow the CT_RPr schema order:
+        # rFonts, b, color, sz, vertAlign
+        if mapped_font:
+            rfonts = OxmlElement('w:rFonts')
+            rfonts.set(qn('w:ascii'), mapped_font)
+            rfonts.set(qn('w:hAnsi'), mapped_font)
+            rpr.append(rfonts)
+        if bold:
+            rpr.append(OxmlElement('w:b'))
+        if color:
+            color_elem = OxmlElement('w:color')
+            color_elem.set(qn('w:val'), str(color))
+            rpr.append(color_elem)
+        if pt_size:
+            sz = OxmlElement('w:sz')
+            sz.set(qn('w:val'), str(int(pt_size.pt * 2)))
+            rpr.append(sz)
+        if superscript or subscript:
+            vert = OxmlElement('w:vertAlign')
+            vert.set(qn('w:val'), 'superscript' if superscript else 'subscript')
+            rpr.append(vert)
+        if len(rpr) == 0:
+            return None
+        return rpr
 
     def _add_content(self, paragraph, content: List[TextContent], resource_zip: Optional[zipfile.ZipFile] = None):
         """Add text runs and images to a paragraph with proper styling."""
+        # Text-only paragraphs (the common case) get their runs built as
+        # one lxml fragment and attached in a single extend() call
+        if all(isinstance(item, TextRun) for item in content):
+            paragraph._p.extend(self._build_runs_xml(content))
+            return
+
+        last_idx = len(content) - 1
         for idx, item in enumerate(content):
             if isinstance(item, TextRun):
                 # It's a text run
                 text = item.text
-                if idx == len(content) - 1:
+                if idx == last_idx and text.endswith('\n'):
                     text = text.rstrip('\n')
-                # if len(text) > 0:
-                #     print(f"Ends with {ord(text[-2:][0])}, {ord(text[-1:][0])} '{text[-10:]}'")
                 style = item.style
                 
                 # Create a docx run
@@ -99,51 +458,66 @@ class DocxConverter:
                 # It's an inline image
                 self._add_inline_image(paragraph, item, resource_zip)
 
+    def _fetch_remote_image(self, url: str) -> Path:
+        """Download a remote image into the disk cache, or reuse it.
+
+        Cache entries are keyed by the SHA-256 of the URL and streamed to
+        disk, so repeated references cost one download and memory stays
+        flat regardless of image count or size.
+        """
+        if requests is None:
+            raise ImportError("The 'requests' package is required to download images")
+
+        if self._img_cache_dir is None:
+            self._img_cache_dir = Path(tempfile.mkdtemp(prefix='cc_converter_img_'))
+
+        cache_path = self._img_cache_dir / hashlib.sha256(url.encode()).hexdigest()
+        if not cache_path.exists():
+            response = self._session.get(url, timeout=10, stream=True)
+            try:
+                response.raise_for_status()
+                tmp_path = cache_path.with_suffix('.part')
+                response.raw.decode_content = True
+                with open(tmp_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, 64 * 1024)
+                # Publish atomically so a failed download never leaves a
+                # truncated cache entry behind
+                tmp_path.replace(cache_path)
+            finally:
+                response.close()
+        return cache_path
+
+    def close(self) -> None:
+        """Release the HTTP session and the temporary image cache."""
+        if self._session is not None:
+            self._session.close()
+        if self._img_cache_dir is not None:
+            shutil.rmtree(self._img_cache_dir, ignore_errors=True)
+            self._img_cache_dir = None
+
     def _add_inline_image(self, paragraph, img: ImageInfo, resource_zip: Optional[zipfile.ZipFile] = None):
         """Add an inline image to the paragraph with specified dimensions."""
-        from docx.shared import Inches, Mm
-        
         # Check if it's a URL
         img_path = img.src
         width_param = None
         height_param = None
         
-        # Convert dimensions to docx units (mm)
+        # Convert dimensions to docx units (mm), cached per distinct value
         if img.width:
-            # Convert pixels to mm (assuming 96 DPI)
-            width_param = Mm(img.width * 0.264583)
-        
+            width_param = _px_to_mm(img.width)
+
         if img.height:
-            # Convert pixels to mm (assuming 96 DPI)
-            height_param = Mm(img.height * 0.264583)
+            height_param = _px_to_mm(img.height)
         
         if img_path.startswith('http://') or img_path.startswith('https://'):
             try:
-                import requests
-                from io import BytesIO
-                
-                # Download the image
-                response = requests.get(img_path, timeout=10)
-                response.raise_for_status()
-                
+                # Download the image once per converter; repeats are served
+                # from the disk cache
+                cache_path = self._fetch_remote_image(img_path)
+
                 # Add the image as a run in the paragraph
                 run = paragraph.add_run()
-                if width_param and height_param:
-                    run.add_picture(BytesIO(response.content), width=width_param, height=height_param)
-                elif width_param:
-                    run.add_picture(BytesIO(response.content), width=width_param)
-                elif height_param:
-                    run.add_picture(BytesIO(response.content), height=height_param)
-                else:
-                    run.add_picture(BytesIO(response.content))
-            except Exception as e:
-                # Log error but continue
-                print(f"Error adding image from URL: {img_path} - {str(e)}")
-        elif resource_zip:
-            # It's a local path in the zip file
-            try:
-                with resource_zip.open(img_path) as img_file:
-                    run = paragraph.add_run()
+                with open(cache_path, 'rb') as img_file:
                     if width_param and height_param:
                         run.add_picture(img_file, width=width_param, height=height_param)
                     elif width_param:
@@ -152,7 +526,29 @@ class DocxConverter:
                         run.add_picture(img_file, height=height_param)
                     else:
                         run.add_picture(img_file)
-            except (KeyError, zipfile.BadZipFile) as e:
+            except Exception as e:
+                # Log error but continue
+                print(f"Error adding image from URL: {img_path} - {str(e)}")
+        elif resource_zip:
+            # It's a local path in the zip file
+            try:
+                data = self._zip_image_cache.get(img_path)
+                if data is None:
+                    if img_path not in self._zip_names:
+                        print(f"Error adding image from zip: {img_path} - not found in archive")
+                        return
+                    data = resource_zip.read(img_path)
+                img_file = BytesIO(data)
+                run = paragraph.add_run()
+                if width_param and height_param:
+                    run.add_picture(img_file, width=width_param, height=height_param)
+                elif width_param:
+                    run.add_picture(img_file, width=width_param)
+                elif height_param:
+                    run.add_picture(img_file, height=height_param)
+                else:
+                    run.add_picture(img_file)
+            except zipfile.BadZipFile as e:
                 # Log error but continue
                 print(f"Error adding image from zip: {img_path} - {str(e)}")
         else:
@@ -161,87 +557,27 @@ class DocxConverter:
 
     def _apply_style_to_run(self, docx_run, style: TextStyle):
         """Apply text styling to a docx run."""
-        from docx.shared import Pt, RGBColor
-
-        # Set font family if available
-        if style.font_family:
-            mapped_font = self.font_mapping.get(style.font_family, style.font_family)
-            docx_run.font.name = mapped_font
-
-        # Set font size if available
-        if style.font_size:
-            docx_run.font.size = Pt(style.font_size)
-
-        # Set bold
-        docx_run.font.bold = style.bold
-
-        # Set color if available
-        if style.color:
-            # Parse color string (like "#000000" or "rgb(0,0,0)")
-            rgb = self._parse_color(style.color)
-            if rgb:
-                docx_run.font.color.rgb = RGBColor(*rgb)
-
-        # Set superscript/subscript
-        docx_run.font.superscript = style.superscript
-        docx_run.font.subscript = style.subscript
-
-    def _parse_color(self, color_str: str) -> Optional[Tuple[int, int, int]]:
-        """Parse a color string into RGB values."""
-        import re
-
-        # Handle hex color values
-        if color_str.startswith("#"):
-            color_hex = color_str.lstrip("#")
-            try:
-                if len(color_hex) == 3:  # Short form like #RGB
-                    r = int(color_hex[0] + color_hex[0], 16)
-                    g = int(color_hex[1] + color_hex[1], 16)
-                    b = int(color_hex[2] + color_hex[2], 16)
-                    return (r, g, b)
-                elif len(color_hex) == 6:  # Long form like #RRGGBB
-                    r = int(color_hex[0:2], 16)
-                    g = int(color_hex[2:4], 16)
-                    b = int(color_hex[4:6], 16)
-                    return (r, g, b)
-            except ValueError:
-                pass
-
-        # Handle rgb() format
-        rgb_match = re.match(
-            r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)",
-            color_str
-        )
-        if rgb_match:
-            try:
-                r = int(rgb_match.group(1))
-                g = int(rgb_match.group(2))
-                b = int(rgb_match.group(3))
-                return (r, g, b)
-            except ValueError:
-                pass
-
-        # Handle common color names
-        color_map = {
-            "black": (0, 0, 0),
-            "white": (255, 255, 255),
-            "red": (255, 0, 0),
-            "green": (0, 128, 0),
-            "blue": (0, 0, 255),
-            "yellow": (255, 255, 0),
-            "purple": (128, 0, 128),
-            "cyan": (0, 255, 255),
-            "magenta": (255, 0, 255),
-            "gray": (128, 128, 128),
-            "grey": (128, 128, 128),
-        }
-
-        color_str = color_str.lower()
-        if color_str in color_map:
-            return color_map[color_str]
-
-        return None
-
+        # Plain runs are the common case; skip the rPr work entirely and
+        # let them inherit the paragraph style
+        if style == _DEFAULT_STYLE:
+            return
+
+        mapped_font, pt_size, bold, color, superscript, subscript = self._resolve_style(style)
+        font = docx_run.font
+        if mapped_font:
+            font.name = mapped_font
+        if pt_size:
+            font.size = pt_size
+        # Only set the boolean properties when they deviate from the
+        # inherited default; an explicit False still materializes XML
+        if bold:
+            font.bold = True
+        if color:
+            font.color.rgb = color
+        if superscript:
+            font.superscript = True
+        if subscript:
+            font.subscript = True
 
 def convert_assessment_to_docx(
     assessment: Assessment,
@@ -251,7 +587,8 @@ def convert_assessment_to_docx(
     is_answer_key: bool = False,
     template_path: Optional[Union[str, Path]] = None,
     input_xml_path: Optional[Union[str, Path]] = None,
-    output_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None,
+    converter: Optional[DocxConverter] = None
 ):
     """Convert an Assessment object to a docx file.
 
@@ -265,6 +602,8 @@ def convert_assessment_to_docx(
             will use the default template in the package.
         input_xml_path: Optional path to the source XML file being converted.
         output_dir: Optional base output directory for relative path logging.
+        converter: Optional DocxConverter to reuse so its caches span
+            conversions; when omitted a converter is created and closed here.
     """
     output_path = Path(output_path)
     if template_path:
@@ -275,7 +614,7 @@ def convert_assessment_to_docx(
     # Print input and output paths
     if input_xml_path:
         if output_dir:
-            rel_output_path = output_path.relative_to(output_dir)
+            rel_output_path = os.path.relpath(output_path, output_dir)
             print(f"Converting from XML: {input_xml_path} to docx: {rel_output_path}")
         else:
             print(f"Converting from XML: {input_xml_path} to docx: {output_path}")
@@ -289,11 +628,79 @@ def convert_assessment_to_docx(
         zip_to_close = zipfile.ZipFile(resource_zip, 'r')
         resource_zip = zip_to_close
 
-    try:
-        # Create converter and convert
+    owns_converter = converter is None
+    if owns_converter:
         converter = DocxConverter(font_mapping, template_path)
+    try:
         converter.convert_assessment(assessment, output_path, resource_zip, is_answer_key)
     finally:
+        if owns_converter:
+            converter.close()
+        # Close the zipfile if we opened it
+        if zip_to_close:
+            zip_to_close.close()
+
+
+def convert_assessment_pair_to_docx(
+    assessment: Assessment,
+    output_path: Union[str, Path],
+    key_path: Union[str, Path],
+    resource_zip: Optional[Union[str, zipfile.ZipFile]] = None,
+    font_mapping: Optional[Dict[str, str]] = None,
+    template_path: Optional[Union[str, Path]] = None,
+    input_xml_path: Optional[Union[str, Path]] = None,
+    output_dir: Optional[Path] = None,
+    converter: Optional[DocxConverter] = None
+):
+    """Convert an Assessment to the student docx and answer key in one build.
+
+    Args:
+        assessment: The Assessment object to convert.
+        output_path: The path where the student docx will be saved.
+        key_path: The path where the answer-key docx will be saved.
+        resource_zip: An optional zipfile or path to a zipfile containing resources.
+        font_mapping: An optional mapping from font names in the source to font names in docx.
+        template_path: Optional path to a template docx file. If not provided,
+            will use the default template in the package.
+        input_xml_path: Optional path to the source XML file being converted.
+        output_dir: Optional base output directory for relative path logging.
+        converter: Optional DocxConverter to reuse so its caches span
+            conversions; when omitted a converter is created and closed here.
+    """
+    output_path = Path(output_path)
+    key_path = Path(key_path)
+    if template_path:
+        template_path = Path(template_path)
+    if input_xml_path:
+        input_xml_path = Path(input_xml_path)
+
+    # Print input and output paths
+    if input_xml_path:
+        for target in (output_path, key_path):
+            if output_dir:
+                rel_target = os.path.relpath(target, output_dir)
+                print(f"Converting from XML: {input_xml_path} to docx: {rel_target}")
+            else:
+                print(f"Converting from XML: {input_xml_path} to docx: {target}")
+
+    # Create parent directories if they don't exist
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    key_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Handle resource_zip parameter
+    zip_to_close = None
+    if isinstance(resource_zip, str):
+        zip_to_close = zipfile.ZipFile(resource_zip, 'r')
+        resource_zip = zip_to_close
+
+    owns_converter = converter is None
+    if owns_converter:
+        converter = DocxConverter(font_mapping, template_path)
+    try:
+        converter.convert_pair(assessment, output_path, key_path, resource_zip)
+    finally:
+        if owns_converter:
+            converter.close()
         # Close the zipfile if we opened it
         if zip_to_close:
             zip_to_close.close()
@@ -430,9 +430,9 @@ class ConverterAPI:
         return open_url_in_browser(url)
 
 
-def create_html_content():
-    """Create the HTML content for the GUI."""
-    return """
+# The GUI page is static, so build it once at import time instead of
+# constructing the ~30 KB string on every call
+_HTML_CONTENT = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -983,6 +983,11 @@ def create_html_content():
 """
 
 
+def create_html_content():
+    """Return the HTML content for the GUI."""
+    return _HTML_CONTENT
+
+
 def main():
     """Main function to start the GUI application."""
     # Parse command line arguments
@@ -1,5 +1,18 @@
+import functools
+import io
+import os
+import re
+import threading
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+
+# lxml (libxml2) traverses manifest trees far faster than the stdlib
+# implementation; fall back to ElementTree when it is not installed
+try:
+    from lxml import etree as _etree
+except ImportError:
+    _etree = ET
 from typing import Dict, List, Optional, Set, Tuple, Any
 import shutil
 import zipfile
@@ -8,9 +21,68 @@ import html
 import json
 from datetime import datetime
 
-from cc_converter.docx_converter import convert_assessment_to_docx
+try:
+    # orjson serializes straight to UTF-8 bytes in C; fall back to the
+    # stdlib encoder when it is not installed
+    import orjson
+except ImportError:
+    orjson = None
+
+from cc_converter.docx_converter import DocxConverter, convert_assessment_pair_to_docx
 from cc_converter.xml_parser import parse_cartridge, ParserError
 
+# Characters not allowed in file or directory names, mapped to '_' so
+# titles can be sanitized in one translate pass
+_INVALID_FILENAME_CHARS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# First ident attribute in a QTI file, used to match assessments to files
+_IDENT_RE = re.compile(rb'ident="([^"]+)"')
+
+# Manifest namespaces, shared by the precompiled lookups below
+_NS = {
+    'imscp': 'http://www.imsglobal.org/xsd/imsccv1p2/imscp_v1p1',
+    'lom': 'http://ltsc.ieee.org/xsd/imsccv1p2/LOM/resource',
+    'lomimscc': 'http://ltsc.ieee.org/xsd/imsccv1p2/LOM/manifest'
+}
+
+
+def _file_ext(name: str) -> str:
+    """Lowercased extension of *name* including the dot, or '' when none."""
+    dot = name.rfind('.')
+    return name[dot:].lower() if dot != -1 else ''
+
+
+def _base_name(path: str) -> str:
+    """Final component of a zip entry path, without building a Path."""
+    return path.rsplit('/', 1)[-1]
+
+
+def _compile_xpath(path: str):
+    """Return a callable that matches *path* against an element.
+
+    With lxml the expression is compiled once at import time; the stdlib
+    fallback closes over the path string and namespace map, so callers
+    never rebuild either per lookup.
+    """
+    if _etree is not ET:
+        return _etree.XPath(path, namespaces=_NS)
+
+    def finder(elem, _path=path):
+        return elem.findall(_path, _NS)
+
+    return finder
+
+
+_XP_RESOURCES = _compile_xpath('.//imscp:resources')
+_XP_RESOURCE = _compile_xpath('.//imscp:resource')
+_XP_FILE = _compile_xpath('.//imscp:file')
+_XP_ORGANIZATIONS = _compile_xpath('.//imscp:organizations')
+_XP_ITEM = _compile_xpath('.//imscp:item')
+_XP_ORGANIZATION = _compile_xpath('.//imscp:organization')
+_XP_COURSE_TITLE = _compile_xpath('.//lomimscc:title/lomimscc:string')
+_XP_CHILD_TITLE = _compile_xpath('./imscp:title')
+_XP_CHILD_ITEM = _compile_xpath('./imscp:item')
+
 
 @dataclass
 class OrganizationItem:
@@ -32,7 +104,7 @@ class Resource:
     type: str
     href: str
     files: List[str] = None
-    
+
     def __post_init__(self):
         if self.files is None:
             self.files = []
@@ -75,6 +147,22 @@ class HierarchyConverter:
         self.assessments_by_file = {}
         self.progress_callback = None
         self.output_dir = None  # Store the output directory for relative path logging
+        self._docx_converter = None  # Shared per-cartridge DocxConverter so caches span assessments
+        self._manifest_root = None  # Parsed imsmanifest.xml root, shared by the manifest readers
+        self._cartridge_path = None  # Path of the cartridge currently being converted
+        self._copy_pool = None  # Thread pool for file extractions
+        self._copy_futures = []  # Outstanding extraction jobs
+        self._dest_jobs = {}  # Destination -> latest (entry, error type, error prefix)
+        self._dest_futures = {}  # Destination -> future of the job writing it
+        self._dest_contents = {}  # Destination -> entry whose bytes it holds
+        self._failed_dests = set()  # Destinations whose final extraction failed
+        self._pending_file_infos = []  # (node, file_info, destination) awaiting copy success
+        self._zip_names = set()  # Archive entry names, cached once per cartridge
+        self._extracted_cache = {}  # Zip entry name -> first extracted destination
+        self._xml_names = []  # XML entries in archive order
+        self._thread_zips = threading.local()  # Per-worker cartridge handles
+        self._open_zips = []  # All per-worker handles, closed after the pool drains
+        self._open_zips_lock = threading.Lock()
         self.total_xml_size = 0  # Total size of XML files to convert
         self.processed_xml_size = 0  # Size of XML files already processed
         
@@ -184,98 +272,120 @@ class HierarchyConverter:
         # Parse the cartridge to get assessments and loose files
         assessments, loose_files = parse_cartridge(str(cartridge_path), self.font_mapping, limit)
         
+        # One DocxConverter for the whole cartridge, so its image caches
+        # are shared across every assessment
+        self._docx_converter = DocxConverter(self.font_mapping, self.template_path)
+
+        # File extractions are pure IO, so they run on a thread pool while
+        # the main thread keeps converting assessments
+        self._cartridge_path = cartridge_path
+        self._copy_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        self._copy_futures = []
+
         # Store assessments by their file path for later use
-        with zipfile.ZipFile(cartridge_path, 'r') as zf:
-            # Parse the manifest to get organization and resources
-            self._parse_manifest_from_zip(zf)
-            
-            # Extract the organization hierarchy
-            organization = self._extract_organization_from_zip(zf)
-            
-            # Create a mapping of assessments by their XML file path
-            self._create_assessment_mapping(zf, assessments)
-            
-            # Calculate total XML file sizes for progress tracking
-            self._calculate_total_xml_size(zf)
-            
-            # Report initial progress if there are XML files to convert
-            if self.total_xml_size > 0:
-                self._report_progress(f"Starting DOCX conversion of {len(self.assessments_by_file)} XML files...", 0)
-            
-            # Create the directory structure and hierarchy
-            hierarchy = self._create_directory_structure(organization, output_dir, zf, assessments)
-            
-            # Copy unreferenced resources to loose files directory
-            self._copy_loose_files(output_dir, zf, loose_files)
-            
-            return hierarchy
+        try:
+            with zipfile.ZipFile(cartridge_path, 'r') as zf:
+                # Cache the archive listing once; namelist() builds a fresh
+                # list on every call and membership tests want a set
+                names = zf.namelist()
+                self._zip_names = set(names)
+                self._xml_names = [n for n in names if _file_ext(n) == '.xml']
+                self._extracted_cache = {}
+                self._dest_jobs = {}
+                self._dest_futures = {}
+                self._dest_contents = {}
+                self._failed_dests = set()
+                self._pending_file_infos = []
+
+                # Parse the manifest once; the resource and organization
+                # readers share the cached root
+                with zf.open("imsmanifest.xml") as manifest_file:
+                    self._manifest_root = _etree.parse(
+                        io.BufferedReader(manifest_file, buffer_size=1 << 20)).getroot()
+
+                # Parse the manifest to get organization and resources
+                self._parse_manifest()
+
+                # Extract the organization hierarchy
+                organization = self._extract_organization()
+
+                # Create a mapping of assessments by their XML file path
+                self._create_assessment_mapping(zf, assessments)
+
+                # Calculate total XML file sizes for progress tracking
+                self._calculate_total_xml_size(zf)
+
+                # Report initial progress if there are XML files to convert
+                if self.total_xml_size > 0:
+                    self._report_progress(f"Starting DOCX conversion of {len(self.assessments_by_file)} XML files...", 0)
+
+                # Create the directory structure and hierarchy
+                hierarchy = self._create_directory_structure(organization, output_dir, zf, assessments)
+
+                # Copy unreferenced resources to loose files directory
+                self._copy_loose_files(output_dir, zf, loose_files)
+
+                # Wait for queued extractions before the zip is closed
+                self._drain_copy_jobs()
+
+                return hierarchy
+        finally:
+            self._copy_pool.shutdown(wait=True)
+            self._copy_pool = None
+            for worker_zf in self._open_zips:
+                worker_zf.close()
+            self._open_zips = []
+            self._thread_zips = threading.local()
+            self._docx_converter.close()
     
-    def _parse_manifest_from_zip(self, zf: zipfile.ZipFile) -> None:
-        """Parse the imsmanifest.xml file from the zip to extract organization and resources."""
-        with zf.open("imsmanifest.xml") as manifest_file:
-            tree = ET.parse(manifest_file)
-        
-        root = tree.getroot()
-        
-        # Define namespaces
-        namespaces = {
-            'imscp': 'http://www.imsglobal.org/xsd/imsccv1p2/imscp_v1p1',
-            'lom': 'http://ltsc.ieee.org/xsd/imsccv1p2/LOM/resource',
-            'lomimscc': 'http://ltsc.ieee.org/xsd/imsccv1p2/LOM/manifest'
-        }
-        
+    def _parse_manifest(self) -> None:
+        """Extract organization and resources from the cached manifest root."""
+        root = self._manifest_root
+
         # Parse resources
-        resources_elem = root.find('.//imscp:resources', namespaces)
-        if resources_elem is not None:
-            for resource_elem in resources_elem.findall('.//imscp:resource', namespaces):
+        resources_elems = _XP_RESOURCES(root)
+        if resources_elems:
+            for resource_elem in _XP_RESOURCE(resources_elems[0]):
                 identifier = resource_elem.get('identifier')
                 resource_type = resource_elem.get('type', '')
                 href = resource_elem.get('href', '')
-                
+
                 files = []
-                for file_elem in resource_elem.findall('.//imscp:file', namespaces):
+                for file_elem in _XP_FILE(resource_elem):
                     file_href = file_elem.get('href')
                     if file_href:
                         files.append(file_href)
-                
+
                 self.resources[identifier] = Resource(
                     identifier=identifier,
                     type=resource_type,
                     href=href,
                     files=files
                 )
-        
+
         # Parse organization to track referenced resources
-        organizations_elem = root.find('.//imscp:organizations', namespaces)
-        if organizations_elem is not None:
-            for item_elem in organizations_elem.findall('.//imscp:item', namespaces):
+        organizations_elems = _XP_ORGANIZATIONS(root)
+        if organizations_elems:
+            for item_elem in _XP_ITEM(organizations_elems[0]):
                 identifierref = item_elem.get('identifierref')
                 if identifierref:
                     self.referenced_resources.add(identifierref)
     
-    def _extract_organization_from_zip(self, zf: zipfile.ZipFile) -> OrganizationItem:
-        """Extract the organization hierarchy from the manifest in the zip."""
-        with zf.open("imsmanifest.xml") as manifest_file:
-            tree = ET.parse(manifest_file)
-        
-        root = tree.getroot()
-        
-        # Define namespaces
-        namespaces = {
-            'imscp': 'http://www.imsglobal.org/xsd/imsccv1p2/imscp_v1p1',
-            'lom': 'http://ltsc.ieee.org/xsd/imsccv1p2/LOM/resource',
-            'lomimscc': 'http://ltsc.ieee.org/xsd/imsccv1p2/LOM/manifest'
-        }
-        
+    def _extract_organization(self) -> OrganizationItem:
+        """Extract the organization hierarchy from the cached manifest root."""
+        root = self._manifest_root
+
         # Get course title from metadata
-        course_title = self._get_course_title(root, namespaces)
-        
+        course_title = self._get_course_title(root)
+
         # Find the organization
-        organization_elem = root.find('.//imscp:organization', namespaces)
-        if organization_elem is None:
+        organization_elems = _XP_ORGANIZATION(root)
+        if organization_elems:
+            organization_elem = organization_elems[0]
+        else:
             # Fallback to no namespace
             organization_elem = root.find('.//organization')
-        
+
         if organization_elem is None:
             # Create a simple structure if no organization found
             return OrganizationItem(
@@ -285,11 +395,13 @@ class HierarchyConverter:
             )
         
         # Find the root item
-        root_item_elem = organization_elem.find('.//imscp:item', namespaces)
-        if root_item_elem is None:
+        root_item_elems = _XP_ITEM(organization_elem)
+        if root_item_elems:
+            root_item_elem = root_item_elems[0]
+        else:
             # Fallback to no namespace
             root_item_elem = organization_elem.find('.//item')
-        
+
         if root_item_elem is None:
             return OrganizationItem(
                 identifier="root",
@@ -298,17 +410,17 @@ class HierarchyConverter:
             )
         
         # Parse the root item and its children
-        root_item = self._parse_item_element(root_item_elem, namespaces)
+        root_item = self._parse_item_element(root_item_elem)
         # Override the title with the course title
         root_item.title = course_title
         return root_item
     
-    def _get_course_title(self, root: ET.Element, namespaces: Dict[str, str]) -> str:
+    def _get_course_title(self, root: ET.Element) -> str:
         """Extract the course title from metadata."""
         # Try to get title from LOM metadata
-        title_elem = root.find('.//lomimscc:title/lomimscc:string', namespaces)
-        if title_elem is not None and title_elem.text:
-            return title_elem.text.strip()
+        title_elems = _XP_COURSE_TITLE(root)
+        if title_elems and title_elems[0].text:
+            return title_elems[0].text.strip()
         
         # Fallback to no namespace
         title_elem = root.find('.//title/string')
@@ -317,32 +429,30 @@ class HierarchyConverter:
         
         return "Course Content"
     
-    def _parse_item_element(self, item_elem: ET.Element, namespaces: Dict[str, str]) -> OrganizationItem:
+    def _parse_item_element(self, item_elem: ET.Element) -> OrganizationItem:
         """Parse an item element and its children recursively."""
         identifier = item_elem.get('identifier', '')
         identifierref = item_elem.get('identifierref')
-        
-        # Get the title
-        title_elem = item_elem.find('.//imscp:title', namespaces)
-        if title_elem is None:
-            # Fallback to no namespace
-            title_elem = item_elem.find('.//title')
-        
+
+        # Get the title from a direct child only; a descendant search would
+        # pick up nested items' titles and rescan the whole subtree
+        title_elems = _XP_CHILD_TITLE(item_elem)
+        title_elem = title_elems[0] if title_elems else item_elem.find('title')
+
         title = title_elem.text if title_elem is not None and title_elem.text else "Untitled"
-        
+
         # Create the item
         item = OrganizationItem(
             identifier=identifier,
             title=title,
             identifierref=identifierref
         )
-        
+
         # Parse direct children only
-        for child_elem in item_elem:
-            if child_elem.tag.endswith('item') or child_elem.tag == 'item':
-                child_item = self._parse_item_element(child_elem, namespaces)
-                item.children.append(child_item)
-        
+        child_elems = _XP_CHILD_ITEM(item_elem) or item_elem.findall('item')
+        for child_elem in child_elems:
+            item.children.append(self._parse_item_element(child_elem))
+
         return item
     
     def _create_directory_structure(self, organization: OrganizationItem, output_dir: Path, 
@@ -416,22 +526,25 @@ class HierarchyConverter:
                                    parent_dir: Path, zf: zipfile.ZipFile, node: HierarchyNode):
         """Process a web link resource - create DOCX with link information."""
         for file_path in resource.files:
-            if file_path not in zf.namelist():
+            if file_path not in self._zip_names:
                 continue
                 
             try:
                 with zf.open(file_path) as f:
-                    content = f.read().decode('utf-8')
-                    
-                # Parse the web link XML
-                root = ET.fromstring(content)
+                    content = f.read()
+
+                # Parse the web link XML from the raw bytes; lxml refuses
+                # decoded strings that carry an encoding declaration
+                root = _etree.fromstring(content)
                 
                 # Extract title and URL - handle various namespace formats
                 link_title = None
                 link_url = None
                 
-                # Find title and url elements regardless of namespace
-                for elem in root.iter():
+                # Find title and url elements regardless of namespace;
+                # iter('*') yields elements only, so lxml comment and PI
+                # nodes (whose .tag is not a string) never reach the split
+                for elem in root.iter('*'):
                     local_name = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
                     if local_name == 'title' and elem.text:
                         link_title = elem.text
@@ -472,10 +585,10 @@ class HierarchyConverter:
                                       parent_dir: Path, zf: zipfile.ZipFile, node: HierarchyNode):
         """Process HTML webcontent - convert to DOCX."""
         for file_path in resource.files:
-            if file_path not in zf.namelist():
+            if file_path not in self._zip_names:
                 continue
             
-            if not file_path.lower().endswith('.html') and not file_path.lower().endswith('.htm'):
+            if _file_ext(file_path) not in ('.html', '.htm'):
                 # Copy non-HTML files normally (images, etc.)
                 self._copy_file_to_output(file_path, parent_dir, zf, node)
                 continue
@@ -510,12 +623,12 @@ class HierarchyConverter:
                                        parent_dir: Path, zf: zipfile.ZipFile, node: HierarchyNode):
         """Process QTI assessment - convert to DOCX quiz/test with answer key."""
         for file_path in resource.files:
-            if file_path not in zf.namelist():
+            if file_path not in self._zip_names:
                 warning_msg = f"Resource file {file_path} referenced in manifest but not found in archive"
                 self._add_warning('missing_file', warning_msg, file_path)
                 continue
             
-            if not file_path.lower().endswith('.xml'):
+            if _file_ext(file_path) != '.xml':
                 continue
                 
             try:
@@ -536,8 +649,22 @@ class HierarchyConverter:
                     sanitized_title = self._sanitize_filename(title)
                     docx_filename = f"{sanitized_title}.docx"
                     docx_path = parent_dir / docx_filename
-                    convert_assessment_to_docx(assessment, docx_path, zf, self.font_mapping, is_answer_key=False, template_path=self.template_path, input_xml_path=file_path, output_dir=self.output_dir)
-                    
+
+                    key_filename = f"{sanitized_title}_key.docx"
+                    key_path = parent_dir / key_filename
+
+                    self.processed_xml_size += file_size / 2
+                    progress = min(100, (self.processed_xml_size / self.total_xml_size) * 100)
+                    self._report_progress(f"Converting {_base_name(file_path)} to DOCX...", progress)
+
+                    # Render the student copy and the answer key from a single
+                    # document build; only the answer blanks differ between
+                    # the two outputs
+                    convert_assessment_pair_to_docx(
+                        assessment, docx_path, key_path, zf,
+                        self.font_mapping, self.template_path, file_path, self.output_dir,
+                        converter=self._docx_converter)
+
                     # Add DOCX file info to hierarchy node
                     docx_file_info = {
                         'name': docx_filename,
@@ -546,17 +673,7 @@ class HierarchyConverter:
                         'title': title
                     }
                     node.files.append(docx_file_info)
-                    
-                    # Update progress after first DOCX conversion
-                    self.processed_xml_size += file_size / 2
-                    progress = min(100, (self.processed_xml_size / self.total_xml_size) * 100)
-                    self._report_progress(f"Converting {Path(file_path).name} to DOCX...", progress)
-                    
-                    # Create answer key DOCX
-                    key_filename = f"{sanitized_title}_key.docx"
-                    key_path = parent_dir / key_filename
-                    convert_assessment_to_docx(assessment, key_path, zf, self.font_mapping, is_answer_key=True, template_path=self.template_path, input_xml_path=file_path, output_dir=self.output_dir)
-                    
+
                     # Add answer key file info to hierarchy node
                     key_file_info = {
                         'name': key_filename,
@@ -565,11 +682,11 @@ class HierarchyConverter:
                         'title': f"{title} (Answer Key)"
                     }
                     node.files.append(key_file_info)
-                    
-                    # Update progress after second DOCX conversion
+
+                    # Update progress after both DOCX conversions
                     self.processed_xml_size += file_size / 2
                     progress = min(100, (self.processed_xml_size / self.total_xml_size) * 100)
-                    self._report_progress(f"Converting {Path(file_path).name} to answer key...", progress)
+                    self._report_progress(f"Converted {_base_name(file_path)} and answer key", progress)
                     
             except Exception as e:
                 error_msg = f"Could not convert assessment {file_path}: {e}"
@@ -579,31 +696,140 @@ class HierarchyConverter:
                                    parent_dir: Path, zf: zipfile.ZipFile, node: HierarchyNode):
         """Process a generic resource - copy files directly."""
         for file_path in resource.files:
-            if file_path not in zf.namelist():
+            if file_path not in self._zip_names:
                 continue
             
             # Skip XML files for generic resources
-            if file_path.lower().endswith('.xml'):
+            if _file_ext(file_path) == '.xml':
                 continue
                 
             self._copy_file_to_output(file_path, parent_dir, zf, node)
     
-    def _copy_file_to_output(self, file_path: str, parent_dir: Path, 
-                              zf: zipfile.ZipFile, node: HierarchyNode):
-        """Copy a file from the zip to the output directory."""
-        try:
+    def _extract_entry(self, zf: zipfile.ZipFile, file_path: str, dest_path: Path) -> None:
+        """Stream a zip entry to *dest_path* without buffering it in memory.
+
+        An entry referenced by several organization items is decompressed
+        only once; later destinations hard-link the first copy, falling
+        back to a plain copy where linking is unsupported.
+        """
+        # Reuse a prior extraction only when that destination still holds
+        # this entry's bytes — it may have been overwritten by a same-named
+        # entry since
+        prior = self._extracted_cache.get(file_path)
+        if prior is not None and self._dest_contents.get(str(prior)) == file_path:
+            if prior == dest_path:
+                # Same entry, same destination: the bytes are already there
+                return
+            try:
+                os.link(prior, dest_path)
+            except OSError:
+                shutil.copyfile(prior, dest_path)
+            self._dest_contents[str(dest_path)] = file_path
+            return
+
+        # The destination may exist as a hard link from an earlier
+        # extraction; unlink first so rewriting creates a fresh inode
+        # instead of mutating the linked copies
+        dest_path.unlink(missing_ok=True)
+
+        size = zf.getinfo(file_path).file_size
+        if size == 0:
+            open(dest_path, 'wb').close()
+        else:
             with zf.open(file_path) as source_file:
-                dest_path = parent_dir / Path(file_path).name
                 with open(dest_path, 'wb') as dest_file:
-                    dest_file.write(source_file.read())
-                
-                # Add to hierarchy
-                file_info = {
-                    'name': Path(file_path).name,
-                    'path': str(dest_path.relative_to(self.output_dir)),
-                    'type': 'original'
-                }
+                    shutil.copyfileobj(source_file, dest_file, min(size, 1 << 20))
+        # Record only finished extractions so a parallel worker never links
+        # to a half-written file
+        self._extracted_cache[file_path] = dest_path
+        self._dest_contents[str(dest_path)] = file_path
+
+    def _worker_zip(self) -> zipfile.ZipFile:
+        """Return the calling worker thread's own handle on the cartridge.
+
+        A shared ZipFile serializes reads on one file object; with a handle
+        per worker the extractions decompress truly in parallel.
+        """
+        zf = getattr(self._thread_zips, 'zf', None)
+        if zf is None:
+            zf = zipfile.ZipFile(self._cartridge_path, 'r')
+            self._thread_zips.zf = zf
+            with self._open_zips_lock:
+                self._open_zips.append(zf)
+        return zf
+
+    def _submit_copy(self, file_path: str, dest_path: Path,
+                     error_type: str, error_prefix: str) -> None:
+        """Queue a zip extraction on the copy pool.
+
+        At most one job runs per destination: submissions (all from the
+        main thread) record the latest entry for a destination in
+        _dest_jobs, and the job re-extracts until what it wrote matches
+        that record. Two entries aimed at the same path therefore never
+        stream into the same open file, and the survivor is the last one
+        submitted, matching the serial behaviour. The worker records its
+        own failures, so draining the futures never raises.
+        """
+        dest_key = str(dest_path)
+        self._dest_jobs[dest_key] = (file_path, error_type, error_prefix)
+
+        pending = self._dest_futures.get(dest_key)
+        if pending is not None and not pending.done():
+            # The queued job picks up the latest entry when it runs
+            return
+
+        def job():
+            while True:
+                entry, err_type, err_prefix = self._dest_jobs[dest_key]
+                try:
+                    self._extract_entry(self._worker_zip(), entry, dest_path)
+                    failed = False
+                except Exception as e:
+                    self._add_error(err_type, f"{err_prefix} {entry}: {e}", entry)
+                    failed = True
+                # A newer submission may have arrived while this one was
+                # being written; loop until the record is satisfied
+                if self._dest_jobs[dest_key][0] == entry:
+                    if failed:
+                        self._failed_dests.add(dest_key)
+                    else:
+                        self._failed_dests.discard(dest_key)
+                    return
+
+        future = self._copy_pool.submit(job)
+        self._dest_futures[dest_key] = future
+        self._copy_futures.append(future)
+
+    def _drain_copy_jobs(self) -> None:
+        """Wait for all queued extractions, then record the successful ones.
+
+        Hierarchy entries for pooled copies are held back until here so
+        hierarchy.json never lists a file whose extraction failed.
+        """
+        for future in self._copy_futures:
+            future.result()
+        self._copy_futures = []
+
+        for node, file_info, dest_key in self._pending_file_infos:
+            if dest_key not in self._failed_dests:
                 node.files.append(file_info)
+        self._pending_file_infos = []
+
+    def _copy_file_to_output(self, file_path: str, parent_dir: Path,
+                              zf: zipfile.ZipFile, node: HierarchyNode):
+        """Copy a file from the zip to the output directory."""
+        try:
+            file_name = _base_name(file_path)
+            dest_path = parent_dir / file_name
+            self._submit_copy(file_path, dest_path, 'file_copy', 'Could not copy file')
+
+            # Add to hierarchy once the queued copy is known to have succeeded
+            file_info = {
+                'name': file_name,
+                'path': str(dest_path.relative_to(self.output_dir)),
+                'type': 'original'
+            }
+            self._pending_file_infos.append((node, file_info, str(dest_path)))
         except Exception as e:
             error_msg = f"Could not copy file {file_path}: {e}"
             self._add_error('file_copy', error_msg, file_path)
@@ -769,10 +995,12 @@ class HierarchyConverter:
                 elif img_src.startswith('./'):
                     img_src = img_src[2:]
                 
-                if img_src in zf.namelist():
-                    with zf.open(img_src) as img_file:
-                        run = paragraph.add_run()
-                        run.add_picture(img_file, width=Inches(4))
+                if img_src in self._zip_names:
+                    # Materialize the bytes; handing add_picture a seekable
+                    # BytesIO avoids python-docx re-reading the entry (and
+                    # the zip inflating it twice) during image detection
+                    run = paragraph.add_run()
+                    run.add_picture(BytesIO(zf.read(img_src)), width=Inches(4))
         except Exception as e:
             # Log but don't fail
             paragraph.add_run(f" [Image: {img_src}] ")
@@ -812,28 +1040,34 @@ class HierarchyConverter:
         
         # Get cartridge name for prefixing files to avoid conflicts
         cartridge_name = output_dir.name if self.shared_loose_files_dir is not None else ""
-        
+
+        # The loose-file list and the unreferenced-resource walk below can
+        # name the same entry; queue each one at most once
+        queued = set()
+
         # Copy files that are not referenced by any resource
         for file_path in loose_files:
             # Skip XML and HTML files - they are converted to DOCX
-            if file_path.lower().endswith('.xml') or file_path.lower().endswith('.html') or file_path.lower().endswith('.htm'):
+            if _file_ext(file_path) in ('.xml', '.html', '.htm'):
+                continue
+
+            if file_path in queued:
                 continue
 
             # Check if the file actually exists in the zip before trying to copy it
-            if file_path in zf.namelist():
+            if file_path in self._zip_names:
                 try:
-                    with zf.open(file_path) as source_file:
-                        # Create unique filename to avoid conflicts
-                        original_filename = Path(file_path).name
-                        if cartridge_name:
-                            # Add cartridge prefix to avoid conflicts in shared directory
-                            dest_filename = f"{cartridge_name}_{original_filename}"
-                        else:
-                            dest_filename = original_filename
-                        
-                        dest_path = loose_dir / dest_filename
-                        with open(dest_path, 'wb') as dest_file:
-                            dest_file.write(source_file.read())
+                    queued.add(file_path)
+                    # Create unique filename to avoid conflicts
+                    original_filename = _base_name(file_path)
+                    if cartridge_name:
+                        # Add cartridge prefix to avoid conflicts in shared directory
+                        dest_filename = f"{cartridge_name}_{original_filename}"
+                    else:
+                        dest_filename = original_filename
+
+                    self._submit_copy(file_path, loose_dir / dest_filename,
+                                      'loose_file_copy', 'Could not copy loose file')
                 except Exception as e:
                     error_msg = f"Could not copy loose file {file_path}: {e}"
                     self._add_error('loose_file_copy', error_msg, file_path)
@@ -841,103 +1075,94 @@ class HierarchyConverter:
                 warning_msg = f"Loose file {file_path} referenced in manifest but not found in archive"
                 self._add_warning('missing_loose_file', warning_msg, file_path)
         
-        # Also copy resources that are not referenced in the organization AND not processed
-        for identifier, resource in self.resources.items():
-            if identifier not in self.referenced_resources and identifier not in self.processed_resources:
-                # This is a truly loose resource
-                for file_path in resource.files:
-                    # Skip XML and HTML files - they are converted to DOCX
-                    if file_path.lower().endswith('.xml') or file_path.lower().endswith('.html') or file_path.lower().endswith('.htm'):
-                        continue
-                        
-                    # Check if the file actually exists in the zip before trying to copy it
-                    if file_path in zf.namelist():
-                        try:
-                            with zf.open(file_path) as source_file:
-                                # Create unique filename to avoid conflicts
-                                original_filename = Path(file_path).name
-                                if cartridge_name:
-                                    # Add cartridge prefix to avoid conflicts in shared directory
-                                    dest_filename = f"{cartridge_name}_{original_filename}"
-                                else:
-                                    dest_filename = original_filename
-                                
-                                dest_path = loose_dir / dest_filename
-                                with open(dest_path, 'wb') as dest_file:
-                                    dest_file.write(source_file.read())
-                        except Exception as e:
-                            error_msg = f"Could not copy unreferenced file {file_path}: {e}"
-                            self._add_error('unreferenced_file_copy', error_msg, file_path)
+        # Also copy resources that are not referenced in the organization AND
+        # not processed; one set difference finds the truly loose ones
+        loose_ids = self.resources.keys() - self.referenced_resources - self.processed_resources
+        for identifier in loose_ids:
+            for file_path in self.resources[identifier].files:
+                # Skip XML and HTML files - they are converted to DOCX
+                if _file_ext(file_path) in ('.xml', '.html', '.htm'):
+                    continue
+
+                if file_path in queued:
+                    continue
+
+                # Check if the file actually exists in the zip before trying to copy it
+                if file_path in self._zip_names:
+                    try:
+                        queued.add(file_path)
+                        # Create unique filename to avoid conflicts
+                        original_filename = _base_name(file_path)
+                        if cartridge_name:
+                            # Add cartridge prefix to avoid conflicts in shared directory
+                            dest_filename = f"{cartridge_name}_{original_filename}"
+                        else:
+                            dest_filename = original_filename
+
+                        self._submit_copy(file_path, loose_dir / dest_filename,
+                                          'unreferenced_file_copy', 'Could not copy unreferenced file')
+                    except Exception as e:
+                        error_msg = f"Could not copy unreferenced file {file_path}: {e}"
+                        self._add_error('unreferenced_file_copy', error_msg, file_path)
     
-    def _sanitize_filename(self, filename: str) -> str:
-        """Sanitize a filename for use as a directory name."""
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Remove leading/trailing spaces and dots
-        filename = filename.strip(' .')
-        
-        # Ensure it's not empty
-        if not filename:
-            filename = "untitled"
-        
-        return filename
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _sanitize_filename(filename: str) -> str:
+        """Sanitize a filename for use as a directory name.
+
+        Titles repeat across a cartridge, so results are memoized.
+        """
+        # Replace invalid characters in a single pass, then drop
+        # leading/trailing spaces and dots; never return an empty name
+        return filename.translate(_INVALID_FILENAME_CHARS).strip(' .') or "untitled"
     
     def _create_assessment_mapping(self, zf: zipfile.ZipFile, assessments: List[Any]) -> None:
         """Create a mapping of assessments by their XML file path."""
         self.assessments_by_file = {}
-        
+
         # Get all XML files from the zip
-        xml_files = [f for f in zf.namelist() if f.lower().endswith('.xml')]
-        
+        xml_files = self._xml_names
+
+        # Read each XML file exactly once up front; the old per-assessment
+        # re-read made this O(assessments x files) full decompressions of
+        # the same entries. The searches run on raw bytes, so the files are
+        # never UTF-8 decoded at all
+        file_contents: Dict[str, bytes] = {}
+        file_idents: Dict[str, Optional[str]] = {}
+        file_contents_lower: Dict[str, bytes] = {}
+        for xml_file in xml_files:
+            try:
+                xml_content = zf.read(xml_file)
+            except Exception as e:
+                warning_msg = f"Could not read XML file {xml_file} for assessment mapping: {e}"
+                self._add_warning('xml_reading', warning_msg, xml_file)
+                continue
+            file_contents[xml_file] = xml_content
+            id_match = _IDENT_RE.search(xml_content)
+            file_idents[xml_file] = id_match.group(1).decode('utf-8', 'replace') if id_match else None
+            file_contents_lower[xml_file] = xml_content.lower()
+
         # For each assessment, try to find which XML file it came from
         for assessment in assessments:
-            # Try to match by parsing each XML file and comparing titles
-            for xml_file in xml_files:
-                try:
-                    with zf.open(xml_file) as f:
-                        xml_content = f.read().decode('utf-8')
-                    
-                    # Try multiple matching strategies
-                    matched = False
-                    
-                    # Strategy 1: Exact title match
-                    if assessment.title in xml_content:
-                        self.assessments_by_file[xml_file] = assessment
-                        matched = True
-                        break
-                    
-                    # Strategy 2: ID match (extract ID from XML and compare with assessment ID)
-                    import re
-                    # Look for ident="..." in the XML
-                    id_match = re.search(r'ident="([^"]+)"', xml_content)
-                    if id_match and id_match.group(1) == assessment.ident:
-                        self.assessments_by_file[xml_file] = assessment
-                        matched = True
-                        break
-                    
-                    # Strategy 3: Case-insensitive title match
-                    if assessment.title.lower() in xml_content.lower():
-                        self.assessments_by_file[xml_file] = assessment
-                        matched = True
-                        break
-                    
-                    # Strategy 4: Partial title match (first 20 characters)
-                    title_start = assessment.title[:20]
-                    if title_start in xml_content:
-                        self.assessments_by_file[xml_file] = assessment
-                        matched = True
-                        break
-                        
-                except Exception as e:
-                    warning_msg = f"Could not read XML file {xml_file} for assessment mapping: {e}"
-                    self._add_warning('xml_reading', warning_msg, xml_file)
-                    continue
-            
+            matched = False
+            title = assessment.title.encode('utf-8')
+            title_lower = title.lower()
+            title_start = assessment.title[:20].encode('utf-8')
+            for xml_file, xml_content in file_contents.items():
+                # Strategy 1: Exact title match
+                # Strategy 2: ID match against the file's first ident
+                # Strategy 3: Case-insensitive title match
+                # Strategy 4: Partial title match (first 20 characters)
+                if (title in xml_content
+                        or file_idents[xml_file] == assessment.ident
+                        or title_lower in file_contents_lower[xml_file]
+                        or title_start in xml_content):
+                    self.assessments_by_file[xml_file] = assessment
+                    matched = True
+                    break
+
             # If no match found, log it
-            if not any(xml_file in self.assessments_by_file for xml_file in xml_files):
+            if not matched:
                 warning_msg = f"Could not find XML file for assessment '{assessment.title}' (ID: {assessment.ident})"
                 self._add_warning('assessment_mapping', warning_msg)
     
@@ -947,10 +1172,16 @@ class HierarchyConverter:
             # Convert hierarchy to dictionary
             hierarchy_dict = self._hierarchy_node_to_dict(hierarchy)
             
-            # Write to JSON file
+            # Serialize once and write in a single call; json.dump would
+            # issue many small writes through the text encoder instead
             json_path = output_dir / "hierarchy.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(hierarchy_dict, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                json_path.write_bytes(orjson.dumps(hierarchy_dict, option=orjson.OPT_INDENT_2))
+            else:
+                # Encode once and write the bytes in a single call instead
+                # of funneling the payload through a text-mode wrapper
+                payload = json.dumps(hierarchy_dict, indent=2, ensure_ascii=False)
+                json_path.write_bytes(payload.encode('utf-8'))
         except Exception as e:
             error_msg = f"Failed to create hierarchy.json: {str(e)}"
             self._add_error('hierarchy_creation', error_msg)
@@ -993,8 +1224,8 @@ class HierarchyConverter:
         self.processed_xml_size = 0
         
         # Get all XML files that have corresponding assessments
-        for file_path in zf.namelist():
-            if file_path.lower().endswith('.xml') and file_path in self.assessments_by_file:
+        for file_path in self._xml_names:
+            if file_path in self.assessments_by_file:
                 try:
                     file_info = zf.getinfo(file_path)
                     self.total_xml_size += file_info.file_size